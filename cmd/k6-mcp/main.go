@@ -11,6 +11,8 @@ import (
 	"io/fs"
 	"log/slog"
 	"os"
+	"path/filepath"
+	"runtime"
 	"strings"
 
 	"github.com/mark3labs/mcp-go/mcp"
@@ -23,6 +25,9 @@ import (
 	"github.com/oleiade/k6-mcp/internal/logging"
 )
 
+// maxDBConns caps the number of concurrent connections to the search index.
+const maxDBConns = 8
+
 func main() {
 	logger := logging.Default()
 
@@ -42,6 +47,13 @@ func main() {
 	defer closeDB(logger, db)
 	defer removeDBFile(logger, dbFile)
 
+	searchHandler, err := handlers.NewFullTextSearchHandler(db)
+	if err != nil {
+		logger.Error("Error preparing documentation search", "error", err)
+		panic(err)
+	}
+	defer closeSearchHandler(logger, searchHandler)
+
 	s := server.NewMCPServer(
 		"k6",
 		buildinfo.Version,
@@ -52,7 +64,7 @@ func main() {
 
 	// Register tools
 	registerRunTool(s, handlers.WithToolMiddleware("run_k6_script", handlers.NewRunHandler()))
-	registerDocumentationTools(s, handlers.WithToolMiddleware("search_k6_documentation", handlers.NewFullTextSearchHandler(db)))
+	registerDocumentationTools(s, handlers.WithToolMiddleware("search_k6_documentation", searchHandler))
 	registerValidationTool(s, handlers.WithToolMiddleware("validate_k6_script", handlers.NewValidationHandler()))
 	registerTerraformTool(s, handlers.WithToolMiddleware("generate_k6_cloud_terraform_load_test_resource", handlers.NewTerraformHandler()))
 
@@ -192,18 +204,18 @@ func registerBestPracticesResource(s *server.MCPServer) {
 }
 
 func registerTypeDefinitionsResource(s *server.MCPServer) {
+	// Registering the resources only requires the embedded file names: the content of a
+	// type definition file is read when a client requests it, rather than eagerly at startup.
 	_ = fs.WalkDir(k6mcp.TypeDefinitions, ".", func(path string, d fs.DirEntry, err error) error {
+		if err != nil {
+			return err
+		}
 		if !d.IsDir() && strings.HasSuffix(path, internal.DistDTSFileSuffix) {
-			bytes, err := k6mcp.TypeDefinitions.ReadFile(path)
-			if err != nil {
-				return err
-			}
-
 			relPath := strings.TrimPrefix(path, internal.DefinitionsPath)
 			uri := "types://k6/" + relPath
 			displayName := relPath
 
-			fileBytes := bytes
+			filePath := path
 			fileURI := uri
 			resource := mcp.NewResource(
 				fileURI,
@@ -213,6 +225,11 @@ func registerTypeDefinitionsResource(s *server.MCPServer) {
 			)
 
 			s.AddResource(resource, func(ctx context.Context, request mcp.ReadResourceRequest) ([]mcp.ResourceContents, error) {
+				fileBytes, err := k6mcp.TypeDefinitions.ReadFile(filePath)
+				if err != nil {
+					return nil, fmt.Errorf("failed to read embedded type definitions resource: %w", err)
+				}
+
 				return []mcp.ResourceContents{
 					mcp.TextResourceContents{
 						URI:      fileURI,
@@ -256,12 +273,23 @@ func openDB(dbData []byte) (db *sql.DB, dbFile *os.File, err error) {
 		return nil, nil, fmt.Errorf("error closing temporary database file: %w", err)
 	}
 
-	// Open SQLite connection
-	db, err = sql.Open("sqlite3", dbFile.Name()+"?mode=ro")
+	// Open SQLite connection.
+	//
+	// The index is never written to at runtime, so open it as an immutable, read-only
+	// URI: SQLite then skips file locking and change detection on every query. The
+	// "file:" prefix is required for the driver to forward the URI parameters to SQLite.
+	dsn := "file:" + filepath.ToSlash(dbFile.Name()) + "?mode=ro&immutable=1"
+	db, err = sql.Open("sqlite3", dsn)
 	if err != nil {
 		return nil, nil, fmt.Errorf("error opening temporary database file: %w", err)
 	}
 
+	// Keep as many idle connections as may be open, so concurrent searches reuse
+	// connections (and their warm page caches) instead of reopening the database.
+	maxConns := min(runtime.NumCPU(), maxDBConns)
+	db.SetMaxOpenConns(maxConns)
+	db.SetMaxIdleConns(maxConns)
+
 	return db, dbFile, nil
 }
 
@@ -272,6 +300,13 @@ func closeDB(logger *slog.Logger, db *sql.DB) {
 	}
 }
 
+func closeSearchHandler(logger *slog.Logger, h *handlers.FullTextSearchHandler) {
+	err := h.Close()
+	if err != nil {
+		logger.Error("Error closing search handler", "error", err)
+	}
+}
+
 func removeDBFile(logger *slog.Logger, dbFile *os.File) {
 	err := os.Remove(dbFile.Name())
 	if err != nil {
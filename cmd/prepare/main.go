@@ -24,11 +24,15 @@ const (
 	dirPermissions = 0o750
 )
 
+// versionDirRegex matches k6 documentation version directory names, such as "v1.2.x".
+var versionDirRegex = regexp.MustCompile(`^v(\d+)\.(\d+)\.x$`)
+
 func main() {
 	var (
 		indexOnly   = flag.Bool("index-only", false, "Only perform documentation indexing")
 		collectOnly = flag.Bool("collect-only", false, "Only collect type definitions")
-		recreateDB  = flag.Bool("recreate-db", true, "Drop and recreate the FTS5 table before indexing")
+		workers     = flag.Int("workers", 0, "Number of documentation files parsed concurrently (0 uses one per CPU)")
+		recreateDB  = flag.Bool("recreate-db", true, "Rebuild the index from scratch; false skips unchanged files")
 	)
 	flag.Parse()
 
@@ -48,7 +52,7 @@ func main() {
 
 	if runIndex {
 		log.Println("Starting documentation indexing...")
-		if err := runIndexer(workDir, *recreateDB); err != nil {
+		if err := runIndexer(workDir, *recreateDB, *workers); err != nil {
 			log.Fatalf("Documentation indexing failed: %v", err)
 		}
 		log.Println("Documentation indexing completed successfully")
@@ -66,7 +70,7 @@ func main() {
 }
 
 // runIndexer performs the documentation indexing operation
-func runIndexer(workDir string, recreate bool) error {
+func runIndexer(workDir string, recreate bool, workers int) error {
 	const (
 		k6DocsRepo     = "https://github.com/grafana/k6-docs.git"
 		docsSourcePath = "docs/sources/k6"
@@ -85,7 +89,7 @@ func runIndexer(workDir string, recreate bool) error {
 	}()
 
 	log.Printf("Cloning k6 documentation repository...")
-	if err := cloneRepository(k6DocsRepo, tempDir); err != nil {
+	if err := cloneRepository(k6DocsRepo, tempDir, docsSourcePath); err != nil {
 		return fmt.Errorf("failed to clone k6-docs repository: %w", err)
 	}
 
@@ -116,12 +120,22 @@ func runIndexer(workDir string, recreate bool) error {
 		}
 	}()
 
-	indexer := search.NewSQLiteIndexer(db)
+	indexer := search.NewSQLiteIndexer(db, workers)
 	count, err := indexer.IndexDirectory(docsPath)
 	if err != nil {
 		return fmt.Errorf("failed to index documents: %w", err)
 	}
 
+	log.Printf("Optimizing full-text index...")
+	if err := indexer.Optimize(); err != nil {
+		return fmt.Errorf("failed to optimize full-text index: %w", err)
+	}
+
+	log.Printf("Compacting database...")
+	if err := indexer.Compact(); err != nil {
+		return fmt.Errorf("failed to compact database: %w", err)
+	}
+
 	log.Printf("Successfully generated database with %d documents at: %s", count, databasePath)
 	return nil
 }
@@ -158,14 +172,22 @@ func runCollector(workDir string) error {
 	return nil
 }
 
-// cloneRepository clones a git repository to the target directory
-func cloneRepository(repoURL, targetDir string) error {
-	cmd := exec.Command("git", "clone", "--depth", "1", repoURL, targetDir)
+// cloneRepository shallow clones a git repository to the target directory, only checking
+// out the files under sparsePath. Blobs outside of sparsePath are never downloaded.
+func cloneRepository(repoURL, targetDir, sparsePath string) error {
+	cmd := exec.Command("git", "clone", "--depth", "1", "--filter=blob:none", "--sparse", repoURL, targetDir)
 	cmd.Stdout = os.Stdout
 	cmd.Stderr = os.Stderr
 	if err := cmd.Run(); err != nil {
 		return fmt.Errorf("git command failed: %w", err)
 	}
+
+	cmd = exec.Command("git", "-C", targetDir, "sparse-checkout", "set", sparsePath)
+	cmd.Stdout = os.Stdout
+	cmd.Stderr = os.Stderr
+	if err := cmd.Run(); err != nil {
+		return fmt.Errorf("git sparse-checkout command failed: %w", err)
+	}
 	return nil
 }
 
@@ -183,7 +205,6 @@ func findLatestVersion(docsDir string) (string, error) {
 	}
 
 	var versions []Version
-	versionRegex := regexp.MustCompile(`^v(\d+)\.(\d+)\.x$`)
 
 	for _, entry := range entries {
 		if !entry.IsDir() {
@@ -195,7 +216,7 @@ func findLatestVersion(docsDir string) (string, error) {
 			continue
 		}
 
-		matches := versionRegex.FindStringSubmatch(name)
+		matches := versionDirRegex.FindStringSubmatch(name)
 		if matches == nil {
 			continue
 		}
@@ -267,12 +288,15 @@ func cloneTypesRepository(repoURL, repoDir string) error {
 
 // cleanUpTypesRepository removes non-.d.ts files and empty directories
 func cleanUpTypesRepository(repoDir string) error {
-	// First pass: remove any file that does not end with .d.ts
-	removeNonDTS := func(path string, d fs.DirEntry, walkErr error) error {
+	// Single pass: remove any file that does not end with .d.ts, and gather directories
+	// so that empty ones can be pruned afterwards without walking the tree again.
+	var directories []string
+	cleanUp := func(path string, d fs.DirEntry, walkErr error) error {
 		if walkErr != nil {
 			return walkErr
 		}
 		if d.IsDir() {
+			directories = append(directories, path)
 			return nil
 		}
 		if !strings.HasSuffix(d.Name(), internal.DistDTSFileSuffix) {
@@ -283,26 +307,11 @@ func cleanUpTypesRepository(repoDir string) error {
 		return nil
 	}
 
-	if err := filepath.WalkDir(repoDir, removeNonDTS); err != nil {
+	if err := filepath.WalkDir(repoDir, cleanUp); err != nil {
 		return fmt.Errorf("failed to walk directory for cleanup: %w", err)
 	}
 
-	// Second pass: gather directories and prune empty ones from deepest to root
-	var directories []string
-	collectDirs := func(path string, d fs.DirEntry, walkErr error) error {
-		if walkErr != nil {
-			return walkErr
-		}
-		if d.IsDir() {
-			directories = append(directories, path)
-		}
-		return nil
-	}
-
-	if err := filepath.WalkDir(repoDir, collectDirs); err != nil {
-		return fmt.Errorf("failed to collect directories: %w", err)
-	}
-
+	// Prune empty directories from deepest to root
 	sort.Slice(directories, func(i, j int) bool { return len(directories[i]) > len(directories[j]) })
 	for _, dir := range directories {
 		_ = os.Remove(dir) // remove only if empty
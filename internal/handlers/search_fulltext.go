@@ -14,14 +14,26 @@ import (
 
 // FullTextSearchHandler Handlers aggregates all MCP tool handlers with their dependencies.
 type FullTextSearchHandler struct {
-	DB *sql.DB
+	searcher *search.FullTextSearch
 }
 
 var _ ToolHandler = &FullTextSearchHandler{}
 
 // NewFullTextSearchHandler New returns a Handlers instance with provided dependencies.
-func NewFullTextSearchHandler(db *sql.DB) *FullTextSearchHandler {
-	return &FullTextSearchHandler{DB: db}
+//
+// The underlying searcher is created once and reused across requests.
+func NewFullTextSearchHandler(db *sql.DB) (*FullTextSearchHandler, error) {
+	searcher, err := search.NewFullTextSearcher(db)
+	if err != nil {
+		return nil, fmt.Errorf("failed to prepare full-text searcher: %w", err)
+	}
+
+	return &FullTextSearchHandler{searcher: searcher}, nil
+}
+
+// Close releases the resources held by the handler's searcher.
+func (h *FullTextSearchHandler) Close() error {
+	return h.searcher.Close()
 }
 
 // Handle HandleSearch handles the search tool requests.
@@ -75,13 +87,14 @@ func (h *FullTextSearchHandler) Handle(ctx context.Context, request mcp.CallTool
 		}
 	}
 
-	results, err := search.NewFullTextSearcher(h.DB).Search(ctx, query, options)
+	results, err := h.searcher.Search(ctx, query, options)
 	if err != nil {
 		logging.RequestEnd(ctx, "search", false, time.Since(startTime), err)
 		return mcp.NewToolResultError(fmt.Sprintf("search failed: %v", err)), nil
 	}
 
-	resultJSON, err := json.MarshalIndent(results, "", "  ")
+	// Serialize compactly: indentation only inflates the payload sent back to the client.
+	resultJSON, err := json.Marshal(results)
 	if err != nil {
 		logging.RequestEnd(ctx, "search", false, time.Since(startTime), err)
 		return mcp.NewToolResultError("failed to serialize search results"), err
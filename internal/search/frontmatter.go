@@ -0,0 +1,71 @@
+package search
+
+import "bytes"
+
+// frontMatterFence is the line opening and closing the front matter at the very top of a page.
+var frontMatterFence = []byte("---")
+
+// splitFrontMatter separates the front matter fenced by "---" lines at the top of src from
+// the markdown body that follows it, and returns the front matter title along with the body.
+//
+// k6 documentation pages only use flat "key: value" entries for the fields we care about, so
+// the header is scanned line by line instead of going through a full YAML parser for every
+// file. When src does not start with front matter, it is returned unchanged as the body.
+func splitFrontMatter(src []byte) (title string, body []byte) {
+	line, rest, ok := cutLine(src)
+	if !ok || !bytes.Equal(line, frontMatterFence) {
+		return "", src
+	}
+
+	for {
+		line, rest, ok = cutLine(rest)
+		if !ok {
+			// The front matter is never closed
+			return "", src
+		}
+		if bytes.Equal(line, frontMatterFence) {
+			return title, rest
+		}
+
+		// Nested entries are indented, and never hold the page title
+		key, value, found := bytes.Cut(line, []byte(":"))
+		if found && bytes.Equal(key, []byte("title")) {
+			title = unquoteScalar(value)
+		}
+	}
+}
+
+// cutLine slices the first line out of s, without its "\n" or "\r\n" line break.
+// It reports false once s is empty.
+func cutLine(s []byte) (line, rest []byte, ok bool) {
+	if len(s) == 0 {
+		return nil, nil, false
+	}
+	line, rest, _ = bytes.Cut(s, []byte("\n"))
+	return bytes.TrimSuffix(line, []byte("\r")), rest, true
+}
+
+// unquoteScalar trims a single-line YAML scalar value, and strips its quotes if any.
+//
+// Block scalars (">" and "|") span the following lines, which are not parsed: an empty
+// string is returned for them instead of their indicator.
+func unquoteScalar(value []byte) string {
+	value = bytes.TrimSpace(value)
+	if len(value) > 0 && (value[0] == '>' || value[0] == '|') {
+		return ""
+	}
+
+	n := len(value)
+	if n < 2 || value[n-1] != value[0] {
+		return string(value)
+	}
+	switch value[0] {
+	case '"':
+		return string(value[1 : n-1])
+	case '\'':
+		// Single quotes are escaped by doubling them
+		return string(bytes.ReplaceAll(value[1:n-1], []byte("''"), []byte("'")))
+	default:
+		return string(value)
+	}
+}
@@ -0,0 +1,101 @@
+package search
+
+import "testing"
+
+func TestSplitFrontMatter(t *testing.T) {
+	t.Parallel()
+
+	tests := []struct {
+		name      string
+		src       string
+		wantTitle string
+		wantBody  string
+	}{
+		{
+			name:     "no front matter",
+			src:      "# Title\n\nBody\n",
+			wantBody: "# Title\n\nBody\n",
+		},
+		{
+			name:      "title",
+			src:       "---\ntitle: Running k6\nweight: 1\n---\n# Heading\n",
+			wantTitle: "Running k6",
+			wantBody:  "# Heading\n",
+		},
+		{
+			name:     "empty header",
+			src:      "---\n---\nBody\n",
+			wantBody: "Body\n",
+		},
+		{
+			name:      "empty body",
+			src:       "---\ntitle: Only\n---",
+			wantTitle: "Only",
+		},
+		{
+			name:     "unclosed",
+			src:      "---\ntitle: Unclosed\nBody\n",
+			wantBody: "---\ntitle: Unclosed\nBody\n",
+		},
+		{
+			name:     "longer closing line is not a fence",
+			src:      "---\ntitle: Dashes\n----\nBody\n",
+			wantBody: "---\ntitle: Dashes\n----\nBody\n",
+		},
+		{
+			name:     "longer opening line is not a fence",
+			src:      "----\ntitle: Dashes\n---\nBody\n",
+			wantBody: "----\ntitle: Dashes\n---\nBody\n",
+		},
+		{
+			name:      "CRLF line breaks",
+			src:       "---\r\ntitle: Windows\r\n---\r\nBody\r\n",
+			wantTitle: "Windows",
+			wantBody:  "Body\r\n",
+		},
+		{
+			name:     "nested title is ignored",
+			src:      "---\nmeta:\n  title: Nested\n---\nBody\n",
+			wantBody: "Body\n",
+		},
+		{
+			name:     "folded block scalar",
+			src:      "---\ntitle: >-\n  Folded\n---\nBody\n",
+			wantBody: "Body\n",
+		},
+		{
+			name:     "literal block scalar",
+			src:      "---\ntitle: |\n  Literal\n---\nBody\n",
+			wantBody: "Body\n",
+		},
+		{
+			name:      "double quotes",
+			src:       "---\ntitle: \"k6: the guide\"\n---\n",
+			wantTitle: "k6: the guide",
+		},
+		{
+			name:      "single quotes",
+			src:       "---\ntitle: 'What''s new'\n---\n",
+			wantTitle: "What's new",
+		},
+		{
+			name:      "mismatched quotes",
+			src:       "---\ntitle: 'Half\"\n---\n",
+			wantTitle: "'Half\"",
+		},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			t.Parallel()
+
+			title, body := splitFrontMatter([]byte(tt.src))
+			if title != tt.wantTitle {
+				t.Errorf("title = %q, want %q", title, tt.wantTitle)
+			}
+			if string(body) != tt.wantBody {
+				t.Errorf("body = %q, want %q", body, tt.wantBody)
+			}
+		})
+	}
+}
@@ -6,14 +6,36 @@ import (
 	"strings"
 )
 
+// searchQuery is the FTS5 query used to retrieve documentation chunks ranked by bm25.
+const searchQuery = `
+        SELECT title, content, path
+        FROM documentation
+        WHERE documentation MATCH ?
+        ORDER BY bm25(documentation, ?, ?, ?)
+        LIMIT ?`
+
 type FullTextSearch struct {
-	db *sql.DB
+	stmt *sql.Stmt
 }
 
 var _ Search = &FullTextSearch{}
 
-func NewFullTextSearcher(db *sql.DB) *FullTextSearch {
-	return &FullTextSearch{db: db}
+// NewFullTextSearcher returns a FullTextSearch backed by the given database.
+//
+// The search query is prepared once, up front, and shared by every subsequent
+// Search call, so concurrent requests do not each pay for compiling the statement.
+// The caller is responsible for calling Close once the searcher is no longer needed.
+func NewFullTextSearcher(db *sql.DB) (*FullTextSearch, error) {
+	stmt, err := db.Prepare(searchQuery)
+	if err != nil {
+		return nil, err
+	}
+	return &FullTextSearch{stmt: stmt}, nil
+}
+
+// Close releases the prepared search statement.
+func (s *FullTextSearch) Close() error {
+	return s.stmt.Close()
 }
 
 // Search returns up to limit results for the provided MATCH query.
@@ -21,24 +43,26 @@ func (s *FullTextSearch) Search(ctx context.Context, query string, opts Options)
 	// Preprocess the query to handle multi-word searches
 	processedQuery := preprocessQuery(query)
 
-	rows, err := s.db.QueryContext(ctx, `
-        SELECT title, content, path
-        FROM documentation
-        WHERE documentation MATCH ?
-        ORDER BY bm25(documentation, ?, ?, ?)
-        LIMIT ?`, processedQuery, BM25WeightTitle, BM25WeightContent, BM25WeightPath, opts.MaxResults)
+	rows, err := s.stmt.QueryContext(ctx, processedQuery,
+		BM25WeightTitle, BM25WeightContent, BM25WeightPath, opts.MaxResults)
 	if err != nil {
 		return nil, err
 	}
 	defer rows.Close()
 
-	var results []Result
+	// Rows are scanned straight into a slice sized for the expected number of results,
+	// rather than into a temporary copied on every append. A negative maximum means no
+	// limit to SQLite, so it must not reach make either.
+	results := make([]Result, 0, max(0, min(opts.MaxResults, maxPreallocatedResults)))
 	for rows.Next() {
-		var c Result
+		results = append(results, Result{})
+		c := &results[len(results)-1]
 		if err := rows.Scan(&c.Title, &c.Content, &c.Path); err != nil {
 			return nil, err
 		}
-		results = append(results, c)
+	}
+	if err := rows.Err(); err != nil {
+		return nil, err
 	}
 	return results, nil
 }
@@ -51,10 +75,8 @@ func preprocessQuery(query string) string {
 		return query
 	}
 
-	// If query already contains FTS5 operators or quotes, return as-is
-	if strings.Contains(query, " AND ") || strings.Contains(query, " OR ") ||
-		strings.Contains(query, " NEAR ") || strings.Contains(query, "\"") ||
-		strings.Contains(query, "*") || strings.Contains(query, "(") {
+	// If query already contains quotes, prefix wildcards or groups, return as-is
+	if strings.ContainsAny(query, "\"*(") {
 		return query
 	}
 
@@ -64,5 +86,13 @@ func preprocessQuery(query string) string {
 		return query
 	}
 
+	// If query already contains FTS5 operators, return as-is
+	for _, word := range words {
+		switch word {
+		case "AND", "OR", "NEAR":
+			return query
+		}
+	}
+
 	return strings.Join(words, " AND ")
 }
@@ -1,10 +1,12 @@
 package search
 
 import (
+	"crypto/sha256"
 	"database/sql"
-	"io/fs"
+	"encoding/hex"
+	"os"
 	"path/filepath"
-	"strings"
+	"runtime"
 )
 
 // Indexer is the interface that wraps the IndexDirectory method.
@@ -20,44 +22,388 @@ type Indexer interface {
 // It is used to index a directory of documents into a SQLite database.
 type SQLiteIndexer struct {
 	db *sql.DB
+
+	// workers is the number of markdown files parsed concurrently.
+	workers int
 }
 
 // NewSQLiteIndexer creates a new SQLiteIndexer with the given SQLite database.
-func NewSQLiteIndexer(db *sql.DB) *SQLiteIndexer {
-	return &SQLiteIndexer{db: db}
+//
+// The workers argument sets how many markdown files are parsed concurrently.
+// A value lower than 1 uses one worker per available CPU.
+func NewSQLiteIndexer(db *sql.DB, workers int) *SQLiteIndexer {
+	if workers < 1 {
+		workers = runtime.NumCPU()
+	}
+	return &SQLiteIndexer{db: db, workers: workers}
 }
 
 // IndexDirectory walks the provided docsPath and indexes all .md files it finds.
 // It returns the number of files successfully indexed.
+//
+// Walking the directory, parsing markdown files with the indexer's workers, and inserting the
+// resulting chunks all overlap. Chunks are inserted sequentially, in walk order, so that the
+// generated index is deterministic. Inserts are grouped into transactions of about
+// insertBatchSize chunks.
+//
+// Indexed paths are relative to docsPath. Files whose content hash matches the one recorded
+// by a previous run are left untouched, changed files have their chunks replaced, and files
+// that no longer exist are removed: re-indexing into an existing database is idempotent.
 func (i *SQLiteIndexer) IndexDirectory(docsPath string) (int, error) {
+	if err := i.discardUntrackedIndex(); err != nil {
+		return 0, err
+	}
+
+	known, err := i.loadFileHashes()
+	if err != nil {
+		return 0, err
+	}
+
+	writer := newBatchWriter(i.db)
+	defer writer.rollback()
+
+	done := make(chan struct{})
+	defer close(done)
+
+	files, wait := streamMarkdownFiles(done, docsPath, known, i.workers)
+
 	count := 0
-	err := filepath.WalkDir(docsPath, func(path string, d fs.DirEntry, err error) error {
+	seen := make(map[string]struct{}, len(known))
+	for parsed := range files {
+		if parsed.path != "" {
+			seen[parsed.path] = struct{}{}
+		}
+		if parsed.err != nil {
+			// Skip file on parse error
+			continue
+		}
+		if !parsed.unchanged {
+			if ierr := writer.indexFile(parsed); ierr != nil {
+				return count, ierr
+			}
+		}
+		count++
+	}
+	if err := wait(); err != nil {
+		return count, err
+	}
+
+	// Drop the files indexed by a previous run that no longer exist
+	for path := range known {
+		if _, ok := seen[path]; ok {
+			continue
+		}
+		if err := writer.removeFile(path); err != nil {
+			return count, err
+		}
+	}
+
+	return count, writer.commit()
+}
+
+// Optimize merges the FTS5 index b-trees of the documentation table into a single one.
+//
+// It is meant to be called once indexing is complete: the index is built ahead of time and
+// embedded read-only, so queries served from it never have to consult multiple segments.
+func (i *SQLiteIndexer) Optimize() error {
+	_, err := i.db.Exec(`INSERT INTO documentation(documentation) VALUES ('optimize')`)
+	return err
+}
+
+// Compact rebuilds the database file without its free pages.
+//
+// Dropped tables, replaced chunks and the b-tree segments merged by Optimize all leave
+// free pages behind. As the database is embedded into the server binary and copied to
+// disk at startup, compacting it once indexing is complete shrinks both.
+func (i *SQLiteIndexer) Compact() error {
+	_, err := i.db.Exec(`VACUUM`)
+	return err
+}
+
+// discardUntrackedIndex empties the index when it holds documentation rows that are not
+// tracked in indexed_chunks.
+//
+// Databases built before files were tracked hold chunks under absolute paths, and without
+// matching indexed_files and indexed_chunks entries: neither skipping unchanged files nor
+// replacing changed ones can work on them, and indexing on top would duplicate every page.
+func (i *SQLiteIndexer) discardUntrackedIndex() error {
+	var untracked bool
+	err := i.db.QueryRow(`
+        SELECT EXISTS (
+            SELECT 1 FROM documentation
+            WHERE rowid NOT IN (SELECT chunk_rowid FROM indexed_chunks)
+        )`).Scan(&untracked)
+	if err != nil || !untracked {
+		return err
+	}
+
+	tx, err := i.db.Begin()
+	if err != nil {
+		return err
+	}
+	for _, stmt := range []string{
+		`DELETE FROM documentation`,
+		`DELETE FROM indexed_files`,
+		`DELETE FROM indexed_chunks`,
+	} {
+		if _, err := tx.Exec(stmt); err != nil {
+			_ = tx.Rollback()
+			return err
+		}
+	}
+	return tx.Commit()
+}
+
+// loadFileHashes returns the content hashes of the files already present in the index,
+// keyed by their path.
+func (i *SQLiteIndexer) loadFileHashes() (map[string]string, error) {
+	rows, err := i.db.Query(`SELECT path, sha256 FROM indexed_files`)
+	if err != nil {
+		return nil, err
+	}
+	defer rows.Close()
+
+	hashes := make(map[string]string)
+	for rows.Next() {
+		var path, hash string
+		if err := rows.Scan(&path, &hash); err != nil {
+			return nil, err
+		}
+		hashes[path] = hash
+	}
+	return hashes, rows.Err()
+}
+
+// indexFormatVersion identifies how markdown files are turned into chunks. It is mixed into
+// the recorded content hashes, so that bumping it whenever parsing or chunking changes gets
+// every file re-indexed on the next run, even if its content did not change.
+const indexFormatVersion = "3"
+
+// insertBatchSize is the number of chunks after which the pending indexing
+// transaction is committed. Files are never split across transactions.
+const insertBatchSize = 5000
+
+// batchWriter writes parsed files to the index in batched transactions, reusing
+// prepared statements within each transaction instead of auto-committing every row.
+type batchWriter struct {
+	db *sql.DB
+	tx *sql.Tx
+
+	insertChunk  *sql.Stmt
+	recordChunk  *sql.Stmt
+	selectChunks *sql.Stmt
+	deleteChunk  *sql.Stmt
+	upsertHash   *sql.Stmt
+
+	// pending is the number of chunks written in the current transaction.
+	pending int
+}
+
+func newBatchWriter(db *sql.DB) *batchWriter {
+	return &batchWriter{db: db}
+}
+
+// indexFile inserts the chunks of a parsed file, replacing any previously indexed
+// version of it, and records its content hash.
+func (w *batchWriter) indexFile(f parsedFile) error {
+	if err := w.ensureTx(); err != nil {
+		return err
+	}
+
+	if f.known {
+		if err := w.deleteChunks(f.path); err != nil {
+			return err
+		}
+	}
+	for _, c := range f.chunks {
+		res, err := w.insertChunk.Exec(c.Title, c.Content, c.Path)
 		if err != nil {
 			return err
 		}
-		if !d.IsDir() && strings.HasSuffix(d.Name(), ".md") {
-			chunks, perr := ParseMarkdown(path)
-			if perr != nil {
-				// Skip file on parse error
-				return nil
-			}
-			for _, c := range chunks {
-				if ierr := i.insertChunk(c); ierr != nil {
-					return ierr
-				}
-			}
-			count++
+		rowID, err := res.LastInsertId()
+		if err != nil {
+			return err
 		}
+		if _, err := w.recordChunk.Exec(rowID, f.path); err != nil {
+			return err
+		}
+	}
+	if _, err := w.upsertHash.Exec(f.path, f.hash); err != nil {
+		return err
+	}
+
+	w.pending += len(f.chunks)
+	if w.pending >= insertBatchSize {
+		return w.commit()
+	}
+	return nil
+}
+
+// removeFile removes the chunks and the content hash of a previously indexed file.
+func (w *batchWriter) removeFile(path string) error {
+	if err := w.ensureTx(); err != nil {
+		return err
+	}
+
+	if err := w.deleteChunks(path); err != nil {
+		return err
+	}
+	_, err := w.tx.Exec(`DELETE FROM indexed_files WHERE path = ?`, path)
+	return err
+}
+
+// deleteChunks deletes the documentation rows recorded for path, looking them up by rowid
+// rather than scanning the whole FTS5 table for matching paths.
+func (w *batchWriter) deleteChunks(path string) error {
+	rows, err := w.selectChunks.Query(path)
+	if err != nil {
+		return err
+	}
+	var rowIDs []int64
+	for rows.Next() {
+		var rowID int64
+		if err := rows.Scan(&rowID); err != nil {
+			_ = rows.Close()
+			return err
+		}
+		rowIDs = append(rowIDs, rowID)
+	}
+	if err := rows.Close(); err != nil {
+		return err
+	}
+	if err := rows.Err(); err != nil {
+		return err
+	}
+
+	for _, rowID := range rowIDs {
+		if _, err := w.deleteChunk.Exec(rowID); err != nil {
+			return err
+		}
+	}
+	_, err = w.tx.Exec(`DELETE FROM indexed_chunks WHERE path = ?`, path)
+	return err
+}
+
+// ensureTx begins a new transaction unless one is already pending.
+func (w *batchWriter) ensureTx() error {
+	if w.tx != nil {
 		return nil
-	})
+	}
+	return w.begin()
+}
+
+func (w *batchWriter) begin() error {
+	tx, err := w.db.Begin()
 	if err != nil {
-		return count, err
+		return err
+	}
+
+	insertChunk, err := tx.Prepare(`INSERT INTO documentation (title, content, path) VALUES (?, ?, ?)`)
+	if err != nil {
+		_ = tx.Rollback()
+		return err
+	}
+
+	recordChunk, err := tx.Prepare(`INSERT INTO indexed_chunks (chunk_rowid, path) VALUES (?, ?)`)
+	if err != nil {
+		_ = tx.Rollback()
+		return err
+	}
+
+	selectChunks, err := tx.Prepare(`SELECT chunk_rowid FROM indexed_chunks WHERE path = ?`)
+	if err != nil {
+		_ = tx.Rollback()
+		return err
+	}
+
+	deleteChunk, err := tx.Prepare(`DELETE FROM documentation WHERE rowid = ?`)
+	if err != nil {
+		_ = tx.Rollback()
+		return err
+	}
+
+	upsertHash, err := tx.Prepare(`
+        INSERT INTO indexed_files (path, sha256) VALUES (?, ?)
+        ON CONFLICT(path) DO UPDATE SET sha256 = excluded.sha256`)
+	if err != nil {
+		_ = tx.Rollback()
+		return err
 	}
-	return count, nil
+
+	w.tx, w.pending = tx, 0
+	w.insertChunk, w.recordChunk, w.selectChunks, w.deleteChunk, w.upsertHash =
+		insertChunk, recordChunk, selectChunks, deleteChunk, upsertHash
+	return nil
 }
 
-func (i *SQLiteIndexer) insertChunk(c Result) error {
-	_, err := i.db.Exec(`INSERT INTO documentation (title, content, path) VALUES (?, ?, ?)`,
-		c.Title, c.Content, c.Path)
+// commit commits the pending transaction, if any.
+func (w *batchWriter) commit() error {
+	if w.tx == nil {
+		return nil
+	}
+	err := w.tx.Commit()
+	w.tx = nil
 	return err
 }
+
+// rollback aborts the pending transaction, if any.
+func (w *batchWriter) rollback() {
+	if w.tx == nil {
+		return
+	}
+	_ = w.tx.Rollback()
+	w.tx = nil
+}
+
+// parsedFile holds the outcome of parsing a single markdown file.
+type parsedFile struct {
+	// seq is the position of the file in walk order.
+	seq int
+
+	// path is the path of the file, relative to the indexed directory.
+	path string
+
+	// hash is the hex-encoded SHA-256 of the index format version and file content.
+	hash string
+
+	// known reports whether the file is already present in the index.
+	known bool
+
+	// unchanged reports whether the file content matches the indexed version,
+	// in which case it was not parsed at all.
+	unchanged bool
+
+	chunks []Result
+	err    error
+}
+
+// parseMarkdownFile reads and parses the markdown file at path, unless its content
+// hash matches the one recorded in known for its path relative to root.
+func parseMarkdownFile(root, path string, known map[string]string) parsedFile {
+	relPath, err := filepath.Rel(root, path)
+	if err != nil {
+		return parsedFile{err: err}
+	}
+	relPath = filepath.ToSlash(relPath)
+
+	src, err := os.ReadFile(path)
+	if err != nil {
+		return parsedFile{path: relPath, err: err}
+	}
+
+	hasher := sha256.New()
+	hasher.Write([]byte(indexFormatVersion))
+	hasher.Write(src)
+	hash := hex.EncodeToString(hasher.Sum(nil))
+	knownHash, isKnown := known[relPath]
+	if isKnown && knownHash == hash {
+		return parsedFile{path: relPath, hash: hash, known: true, unchanged: true}
+	}
+
+	return parsedFile{
+		path:   relPath,
+		hash:   hash,
+		known:  isKnown,
+		chunks: parseMarkdownSource(relPath, src),
+	}
+}
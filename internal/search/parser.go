@@ -1,7 +1,6 @@
 package search
 
 import (
-	"os"
 	"strings"
 
 	"github.com/yuin/goldmark"
@@ -9,69 +8,74 @@ import (
 	"github.com/yuin/goldmark/text"
 )
 
-func ParseMarkdown(path string) ([]Result, error) {
-	src, err := os.ReadFile(path)
-	if err != nil {
-		return nil, err
-	}
+// sectionHeadingLevel is the deepest heading level that starts a new chunk.
+const sectionHeadingLevel = 2
+
+// parseMarkdownSource splits the markdown content src into search results, attributing
+// them to path.
+//
+// Chunks are cut at section boundaries (headings up to sectionHeadingLevel) during the
+// single walk over the document's AST, so that each result holds one section rather than
+// a whole document.
+//
+// The page front matter is stripped before parsing, and its title, when present, is used
+// as the title of every chunk. Otherwise, the first H1 heading is used.
+func parseMarkdownSource(path string, src []byte) []Result {
+	currentTitle, src := splitFrontMatter(src)
 
 	md := goldmark.New()
 	doc := md.Parser().Parse(text.NewReader(src))
 
 	var chunks []Result
-	var currentTitle string
 	var buffer strings.Builder
 
+	// Empty sections, and sections repeating content already emitted for this page,
+	// would only add redundant rows to the index: skip them.
+	seen := make(map[string]struct{})
 	flush := func() {
-		if buffer.Len() == 0 {
+		content := strings.TrimSpace(buffer.String())
+		buffer.Reset()
+		if content == "" {
+			return
+		}
+		if _, dup := seen[content]; dup {
 			return
 		}
+		seen[content] = struct{}{}
+
 		chunks = append(chunks, Result{
 			Title:   currentTitle,
-			Content: strings.TrimSpace(buffer.String()),
+			Content: content,
 			Path:    path,
 		})
-		buffer.Reset()
 	}
 
+	// Blocks holding inline content are written in full when first visited, and their
+	// descendants are not walked again, so that no text is emitted twice.
 	var walk func(n ast.Node)
 	walk = func(n ast.Node) {
 		switch node := n.(type) {
 		case *ast.Heading:
+			// Start a new chunk at every section boundary
+			if node.Level <= sectionHeadingLevel {
+				flush()
+			}
+
 			// Capture the first H1 as title, but include all headings in content
 			if currentTitle == "" && node.Level == 1 {
 				currentTitle = string(node.Text(src))
 			}
-			buffer.WriteString("\n" + string(node.Text(src)) + "\n")
-		case *ast.Paragraph:
-			buffer.WriteString("\n" + string(node.Text(src)) + "\n")
+			writeInlineBlock(&buffer, node, src)
+			return
+		case *ast.Paragraph, *ast.TextBlock:
+			writeInlineBlock(&buffer, node, src)
+			return
 		case *ast.FencedCodeBlock:
-			var code strings.Builder
-			lines := node.Lines()
-			for i := 0; i < lines.Len(); i++ {
-				line := lines.At(i)
-				code.Write(line.Value(src))
-			}
-			if code.Len() > 0 {
-				buffer.WriteString("\n" + code.String() + "\n")
-			}
+			writeLines(&buffer, node.Lines(), src)
+			return
 		case *ast.CodeBlock:
-			var code strings.Builder
-			lines := node.Lines()
-			for i := 0; i < lines.Len(); i++ {
-				line := lines.At(i)
-				code.Write(line.Value(src))
-			}
-			if code.Len() > 0 {
-				buffer.WriteString("\n" + code.String() + "\n")
-			}
-		case *ast.CodeSpan:
-			textBytes := node.Text(src)
-			if len(textBytes) > 0 {
-				buffer.WriteString(" `" + string(textBytes) + "` ")
-			}
-		case *ast.List:
-			buffer.WriteString("\n" + string(node.Text(src)) + "\n")
+			writeLines(&buffer, node.Lines(), src)
+			return
 		}
 
 		for c := n.FirstChild(); c != nil; c = c.NextSibling() {
@@ -80,5 +84,50 @@ func ParseMarkdown(path string) ([]Result, error) {
 	}
 	walk(doc)
 	flush()
-	return chunks, nil
+	return chunks
+}
+
+// writeInlineBlock writes the inline content of the block n to buf as a newline-delimited block.
+func writeInlineBlock(buf *strings.Builder, n ast.Node, src []byte) {
+	buf.WriteByte('\n')
+	writeInline(buf, n, src)
+	buf.WriteByte('\n')
+}
+
+// writeInline writes the text of the inline descendants of n to buf, in a single pass.
+// Line breaks are preserved, so that words ending and starting adjacent lines do not run
+// together, and code spans keep their backticks.
+func writeInline(buf *strings.Builder, n ast.Node, src []byte) {
+	for c := n.FirstChild(); c != nil; c = c.NextSibling() {
+		switch inline := c.(type) {
+		case *ast.Text:
+			buf.Write(inline.Segment.Value(src))
+			if inline.SoftLineBreak() || inline.HardLineBreak() {
+				buf.WriteByte('\n')
+			}
+		case *ast.CodeSpan:
+			buf.WriteByte('`')
+			writeInline(buf, inline, src)
+			buf.WriteByte('`')
+		default:
+			if c.FirstChild() != nil {
+				writeInline(buf, c, src)
+			} else {
+				buf.Write(c.Text(src))
+			}
+		}
+	}
+}
+
+// writeLines writes the raw lines of a code block to buf as a newline-delimited block.
+func writeLines(buf *strings.Builder, lines *text.Segments, src []byte) {
+	if lines.Len() == 0 {
+		return
+	}
+	buf.WriteByte('\n')
+	for i := 0; i < lines.Len(); i++ {
+		line := lines.At(i)
+		buf.Write(line.Value(src))
+	}
+	buf.WriteByte('\n')
 }
@@ -0,0 +1,120 @@
+package search
+
+import (
+	"io/fs"
+	"path/filepath"
+	"strings"
+	"sync"
+)
+
+// pipelineBufferSize is the capacity of the channels connecting the indexing stages, and
+// the maximum number of files walked but not yet emitted in order.
+const pipelineBufferSize = 64
+
+// parseJob is a markdown file waiting to be parsed, along with its position in walk order.
+type parseJob struct {
+	seq  int
+	path string
+}
+
+// streamMarkdownFiles walks root and parses the .md files it finds through a pipeline:
+// a walker feeds paths to the given number of parse workers, whose results are emitted
+// on the returned channel in walk order. Walking, parsing and consuming the results
+// overlap, and at most pipelineBufferSize files are in flight at once: a file that is slow
+// to parse holds the walker back, rather than letting parsed files pile up behind it.
+//
+// Closing done stops the pipeline early. The returned wait function must be called once
+// the results channel has been drained; it returns the error, if any, that interrupted
+// the directory walk.
+func streamMarkdownFiles(
+	done <-chan struct{}, root string, known map[string]string, workers int,
+) (results <-chan parsedFile, wait func() error) {
+	jobs := make(chan parseJob, pipelineBufferSize)
+	inFlight := make(chan struct{}, pipelineBufferSize)
+	walkDone := make(chan struct{})
+	var walkErr error
+
+	go func() {
+		defer close(walkDone)
+		defer close(jobs)
+
+		seq := 0
+		walkErr = filepath.WalkDir(root, func(path string, d fs.DirEntry, err error) error {
+			if err != nil {
+				return err
+			}
+			if d.IsDir() || !strings.HasSuffix(d.Name(), ".md") {
+				return nil
+			}
+			select {
+			case inFlight <- struct{}{}:
+			case <-done:
+				return filepath.SkipAll
+			}
+			select {
+			case jobs <- parseJob{seq: seq, path: path}:
+				seq++
+				return nil
+			case <-done:
+				return filepath.SkipAll
+			}
+		})
+	}()
+
+	parsed := make(chan parsedFile, pipelineBufferSize)
+	var wg sync.WaitGroup
+	for w := 0; w < workers; w++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			for job := range jobs {
+				f := parseMarkdownFile(root, job.path, known)
+				f.seq = job.seq
+				select {
+				case parsed <- f:
+				case <-done:
+					return
+				}
+			}
+		}()
+	}
+	go func() {
+		wg.Wait()
+		close(parsed)
+	}()
+
+	ordered := make(chan parsedFile)
+	go func() {
+		defer close(ordered)
+		reorder(done, parsed, ordered, inFlight)
+	}()
+
+	return ordered, func() error {
+		<-walkDone
+		return walkErr
+	}
+}
+
+// reorder forwards the files received from in to out, restoring their walk order.
+// It releases a slot of inFlight for every file emitted.
+func reorder(done <-chan struct{}, in <-chan parsedFile, out chan<- parsedFile, inFlight <-chan struct{}) {
+	pending := make(map[int]parsedFile)
+	next := 0
+	for f := range in {
+		pending[f.seq] = f
+		for {
+			ready, ok := pending[next]
+			if !ok {
+				break
+			}
+			delete(pending, next)
+			next++
+			select {
+			case out <- ready:
+				<-inFlight
+			case <-done:
+				return
+			}
+		}
+	}
+}
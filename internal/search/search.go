@@ -26,13 +26,13 @@ type Result struct {
 	Path string `json:"path"`
 
 	// Metadata (optional) is a map of key-value pairs containing additional information related to the document.
-	Metadata map[string]string `json:"metadata"`
+	Metadata map[string]string `json:"metadata,omitempty"`
 
 	// Source (optional) is the original source of the result being returned
-	Source string `json:"source"`
+	Source string `json:"source,omitempty"`
 
 	// Rank represents the scoring or relevance of the document in the context of a search result.
-	Rank float64 `json:"rank"`
+	Rank float64 `json:"rank,omitempty"`
 }
 
 // Options is the options for a search query.
@@ -51,6 +51,10 @@ func DefaultOptions() Options {
 
 const (
 	defaultMaxResults = 10
+
+	// maxPreallocatedResults bounds the capacity reserved up front for search results,
+	// so that a large requested maximum does not translate into a large allocation.
+	maxPreallocatedResults = 20
 )
 
 // BM25 weighting coefficients used to score FTS5 rows.
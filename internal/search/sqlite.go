@@ -6,21 +6,54 @@ import (
 	_ "github.com/mattn/go-sqlite3"
 )
 
+// cachePragmas keep temporary structures and a larger page cache in memory while indexing.
+var cachePragmas = []string{
+	`PRAGMA temp_store = MEMORY;`,
+	`PRAGMA cache_size = -65536;`,
+}
+
+// rebuildPragmas trade durability for write throughput when the index is rebuilt from
+// scratch: a crash then only loses an index that is being regenerated anyway. Incremental
+// runs update an index worth keeping, and keep SQLite's default journaling and syncs.
+var rebuildPragmas = []string{
+	`PRAGMA journal_mode = MEMORY;`,
+	`PRAGMA synchronous = OFF;`,
+}
+
 // InitSQLiteDB opens (or creates) the SQLite database at the given path and ensures
 // the FTS5 table exists with the intended tokenizer options.
-// If recreate is true, it drops any existing table named `documentation` first to rebuild.
+// If recreate is true, it drops any existing `documentation`, `indexed_files` and `indexed_chunks`
+// tables first to rebuild.
 func InitSQLiteDB(path string, recreate bool) (*sql.DB, error) {
 	db, err := sql.Open("sqlite3", path)
 	if err != nil {
 		return nil, err
 	}
 
+	// PRAGMAs apply per connection: pin the pool to a single connection so that every
+	// statement runs with them. Indexing is single-writer anyway.
+	db.SetMaxOpenConns(1)
+	if err := execPragmas(db, cachePragmas); err != nil {
+		return nil, err
+	}
+	if recreate {
+		if err := execPragmas(db, rebuildPragmas); err != nil {
+			return nil, err
+		}
+	}
+
 	// Optionally recreate the FTS5 table for documentation chunks.
 	// Use unicode61 tokenizer with extra token characters useful for code.
 	if recreate {
 		if _, err := db.Exec(`DROP TABLE IF EXISTS documentation;`); err != nil {
 			return nil, err
 		}
+		if _, err := db.Exec(`DROP TABLE IF EXISTS indexed_files;`); err != nil {
+			return nil, err
+		}
+		if _, err := db.Exec(`DROP TABLE IF EXISTS indexed_chunks;`); err != nil {
+			return nil, err
+		}
 	}
 	_, err = db.Exec(`
         CREATE VIRTUAL TABLE IF NOT EXISTS documentation
@@ -34,5 +67,40 @@ func InitSQLiteDB(path string, recreate bool) (*sql.DB, error) {
 	if err != nil {
 		return nil, err
 	}
+
+	// Track the content hash of every indexed file, so that unchanged files can be
+	// skipped when indexing into an existing database.
+	_, err = db.Exec(`
+        CREATE TABLE IF NOT EXISTS indexed_files (
+            path TEXT PRIMARY KEY,
+            sha256 TEXT NOT NULL
+        );
+    `)
+	if err != nil {
+		return nil, err
+	}
+
+	// Map every documentation row to the file it was generated from. FTS5 cannot look rows
+	// up by column value, so replacing a file's chunks deletes them by rowid instead.
+	_, err = db.Exec(`
+        CREATE TABLE IF NOT EXISTS indexed_chunks (
+            chunk_rowid INTEGER PRIMARY KEY,
+            path TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS indexed_chunks_path ON indexed_chunks (path);
+    `)
+	if err != nil {
+		return nil, err
+	}
 	return db, nil
 }
+
+// execPragmas runs the given PRAGMA statements in order.
+func execPragmas(db *sql.DB, pragmas []string) error {
+	for _, pragma := range pragmas {
+		if _, err := db.Exec(pragma); err != nil {
+			return err
+		}
+	}
+	return nil
+}